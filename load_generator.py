@@ -0,0 +1,184 @@
+import argparse
+import asyncio
+import sys
+import time
+
+import numpy as np
+from maze import Maze
+from policy_server import PolicyServer, read_message, write_message
+from value_iteration import value_iteration
+
+
+async def run_client(host, port, positions, on_reply=None):
+    """
+    Stuurt een reeks action-queries over één verbinding.
+
+    Args:
+        host: Host van de policy server
+        port: Poort van de policy server
+        positions: Lijst van posities (rij, kolom) om op te vragen
+        on_reply: Optionele callback die na elk antwoord wordt aangeroepen
+
+    Returns:
+        tuple: (round-trip latencies in seconden, policy versie per antwoord of None bij een fout)
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    latencies = []
+    versions = []
+    try:
+        for position in positions:
+            start = time.perf_counter()
+            write_message(writer, {"op": "action", "position": list(position)})
+            await writer.drain()
+            reply = await read_message(reader)
+            latencies.append(time.perf_counter() - start)
+            # Geen antwoord of een foutmelding telt als mislukte request
+            ok = isinstance(reply, dict) and "error" not in reply and "version" in reply
+            versions.append(reply["version"] if ok else None)
+            if on_reply is not None:
+                on_reply()
+            if reply is None:
+                break
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return latencies, versions
+
+
+async def request(host, port, message):
+    """Stuurt één los bericht en geeft het antwoord terug"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        write_message(writer, message)
+        await writer.drain()
+        return await read_message(reader)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def generate_load(host, port, maze, clients=32, requests=1000, seed=42, halfway=None):
+    """
+    Vuurt gelijktijdige queries af vanuit meerdere clients.
+
+    Args:
+        host: Host van de policy server
+        port: Poort van de policy server
+        maze: Maze instantie waaruit willekeurige posities gekozen worden
+        clients: Aantal gelijktijdige verbindingen
+        requests: Aantal queries per verbinding
+        seed: Seed voor de willekeurige posities
+        halfway: Optioneel asyncio.Event dat gezet wordt zodra de helft van de antwoorden binnen is
+
+    Returns:
+        dict: Aantal requests en fouten, antwoorden per policy versie, of de versie per
+            client nooit terugliep, throughput en client-side p50/p99 latency in ms
+    """
+    total = clients * requests
+    completed = 0
+
+    def on_reply():
+        nonlocal completed
+        completed += 1
+        if halfway is not None and completed * 2 >= total:
+            halfway.set()
+
+    rng = np.random.default_rng(seed)
+    rows = rng.integers(0, maze.height, size=(clients, requests))
+    cols = rng.integers(0, maze.width, size=(clients, requests))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*[
+        run_client(host, port, list(zip(rows[c].tolist(), cols[c].tolist())), on_reply)
+        for c in range(clients)
+    ])
+    elapsed = time.perf_counter() - start
+
+    latencies = np.concatenate([client_latencies for client_latencies, _ in results])
+    versions = [version for _, client_versions in results for version in client_versions]
+    ok_versions = [version for version in versions if version is not None]
+    # Na een hot-swap mag een client nooit meer een oudere policy zien
+    monotonic = all(
+        all(a <= b for a, b in zip(served, served[1:]))
+        for served in ([v for v in client_versions if v is not None] for _, client_versions in results)
+    )
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000 if len(latencies) else (0.0, 0.0)
+    return {
+        "requests": len(latencies),
+        "errors": total - len(ok_versions),
+        "versions": {version: ok_versions.count(version) for version in sorted(set(ok_versions))},
+        "monotonic": monotonic,
+        "throughput": len(latencies) / elapsed,
+        "p50_ms": float(p50),
+        "p99_ms": float(p99),
+    }
+
+
+async def run_local(clients, requests):
+    """Start een server op localhost, belast deze en test een hot-swap halverwege"""
+    maze = Maze()
+    _, policy = value_iteration(maze, gamma=1.0, theta=0.01, verbose=False)
+    server = PolicyServer(maze, policy)
+    host, port = await server.start()
+    try:
+        halfway = asyncio.Event()
+        load = asyncio.create_task(generate_load(host, port, maze, clients, requests, halfway=halfway))
+        # Wissel naar de stochastische policy zodra de helft van de queries beantwoord is
+        await halfway.wait()
+        reload = await request(host, port, {"op": "reload", "stochastic": True})
+        client_stats = await load
+        server_stats = await request(host, port, {"op": "stats"})
+    finally:
+        await server.stop()
+    return client_stats, server_stats, reload
+
+
+def check_hot_swap(client_stats, reload):
+    """
+    Controleert dat de hot-swap zonder fouten verliep.
+
+    Returns:
+        list: Beschrijvingen van gevonden problemen (leeg als alles klopt)
+    """
+    problems = []
+    if client_stats["errors"]:
+        problems.append(f"{client_stats['errors']} requests mislukt")
+    if "version" not in reload:
+        problems.append(f"reload mislukt: {reload}")
+    elif set(client_stats["versions"]) != {0, reload["version"]}:
+        problems.append(f"verwacht versies 0 en {reload['version']}, gezien {sorted(client_stats['versions'])}")
+    if not client_stats["monotonic"]:
+        problems.append("een client kreeg na de swap weer de oude policy")
+    return problems
+
+
+def print_stats(label, stats):
+    """Print latency statistieken op één regel"""
+    print(f"{label}: " + ", ".join(
+        f"{key}={value:.3f}" if isinstance(value, float) else f"{key}={value}"
+        for key, value in stats.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load generator voor de policy server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--requests", type=int, default=1000, help="Aantal queries per client")
+    parser.add_argument("--local", action="store_true",
+                        help="Start zelf een server op localhost in plaats van te verbinden")
+    args = parser.parse_args()
+
+    if args.local:
+        client_stats, server_stats, reload = asyncio.run(run_local(args.clients, args.requests))
+        print(f"Hot-swap naar policy versie {reload.get('version')}")
+        print_stats("Server", server_stats)
+        print_stats("Client", client_stats)
+        problems = check_hot_swap(client_stats, reload)
+        for problem in problems:
+            print(f"FOUT: {problem}")
+        sys.exit(1 if problems else 0)
+
+    client_stats = asyncio.run(generate_load(args.host, args.port, Maze(), args.clients, args.requests))
+    print_stats("Client", client_stats)
+    sys.exit(1 if client_stats["errors"] else 0)
@@ -1,99 +1,346 @@
+import argparse
+import csv
+import json
+import os
+import time
+
 import numpy as np
-import matplotlib.pyplot as plt
-from maze import Maze, Actions
-from policies import RandomPolicy, OptimalPolicy
-from agent import Agent
+from maze import Maze, load_maze, generate_maze
+from policies import policy_to_array
 from value_iteration import value_iteration, stochastic_value_iteration
-from visualization import visualize_maze, visualize_episode, compare_policies
+from vector_env import VectorMaze, SubprocVectorMaze
 
+SOLVERS = ["deterministic", "stochastic", "q-learning", "sarsa"]
 
-def main():
-    # Seed voor reproduceerbaarheid
-    np.random.seed(42)
 
-    # Creëer maze
-    maze = Maze()
+def grid_size(value):
+    """argparse type voor HxW, bijv. 20x30"""
+    try:
+        height, width = (int(x) for x in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"verwacht HxW, bijv. 20x30, niet {value!r}")
+    if height < 1 or width < 1:
+        raise argparse.ArgumentTypeError(f"afmetingen moeten positief zijn: {value!r}")
+    return height, width
 
-    print("Maze Rewards:")
-    print(maze.rewards_grid)
 
-    # Visualiseer de maze
-    visualize_maze(maze, title="Maze Environment with Rewards")
+def positive_int(value):
+    """argparse type voor een geheel getal >= 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"moet minstens 1 zijn, niet {value!r}")
+    return number
+
+
+def non_negative_int(value):
+    """argparse type voor een geheel getal >= 0"""
+    number = int(value)
+    if number < 0:
+        raise argparse.ArgumentTypeError(f"mag niet negatief zijn: {value!r}")
+    return number
+
+
+def positive_float(value):
+    """argparse type voor een getal > 0"""
+    number = float(value)
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"moet groter dan 0 zijn, niet {value!r}")
+    return number
+
+
+def probability(value):
+    """argparse type voor een getal tussen 0 en 1"""
+    number = float(value)
+    if not 0 <= number <= 1:
+        raise argparse.ArgumentTypeError(f"moet tussen 0 en 1 liggen, niet {value!r}")
+    return number
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Los een maze op en evalueer de gevonden policies")
+
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--maze", help="JSON bestand met de maze (standaard: de 4x4 maze uit de opdracht)")
+    source.add_argument("--generate", metavar="HxW", type=grid_size, help="Genereer een willekeurige maze, bijv. 20x30")
+    parser.add_argument("--maze-seed", type=int, default=None, help="Seed voor --generate")
+
+    parser.add_argument("--solver", nargs="+", choices=SOLVERS + ["all"], default=["deterministic", "stochastic"],
+                        help="Een of meer solvers (standaard: deterministic stochastic)")
+    parser.add_argument("--gamma", type=probability, default=1.0, help="Discount factor")
+    parser.add_argument("--theta", type=positive_float, default=0.01, help="Convergentie threshold")
+    parser.add_argument("--slip", type=probability, default=None,
+                        help="Slip-kans van de stochastische omgeving (standaard: die van de maze)")
+    parser.add_argument("--vi-workers", type=non_negative_int, default=0,
+                        help="Processen voor parallelle value iteration (0 = standaard in-place solver)")
+    parser.add_argument("--split", choices=["rows", "columns"], default="rows",
+                        help="Verdeling van het grid bij parallelle value iteration")
+
+    parser.add_argument("--rollouts", type=positive_int, default=1000, help="Aantal evaluatie-episodes per policy")
+    parser.add_argument("--workers", type=positive_int, default=1, help="Aantal processen voor de rollouts")
+    parser.add_argument("--max-steps", type=positive_int, default=100, help="Maximum aantal stappen per episode")
+    parser.add_argument("--seed", type=int, default=42, help="Seed voor reproduceerbaarheid")
+
+    parser.add_argument("--train-steps", type=positive_int, default=1000, help="Lockstep-stappen voor q-learning/sarsa")
+    parser.add_argument("--envs", type=positive_int, default=4096, help="Parallelle omgevingen voor q-learning/sarsa")
+
+    parser.add_argument("--output", help="Schrijf resultaten naar een .json of .csv bestand")
+    parser.add_argument("--plot", action="store_true", help="Toon plots (importeert matplotlib)")
+    parser.add_argument("--quiet", action="store_true", help="Geen voortgang printen")
+    return parser.parse_args(argv)
+
+
+def build_maze(args):
+    """Maakt de maze volgens de command-line argumenten"""
+    if args.maze:
+        maze = load_maze(args.maze)
+    elif args.generate:
+        height, width = args.generate
+        maze = generate_maze(height, width, seed=args.maze_seed)
+    else:
+        maze = Maze()
+    if args.slip is not None:
+        maze.slip_probability = args.slip
+    return maze
+
+
+def solve(maze, solver, args):
+    """
+    Voert één solver uit.
+
+    Returns:
+        tuple: (V dictionary, policy dictionary, extra statistieken)
+    """
+    verbose = not args.quiet
+    if solver in ("deterministic", "stochastic") and args.vi_workers:
+        from parallel_value_iteration import parallel_value_iteration
+        V, policy = parallel_value_iteration(maze, gamma=args.gamma, theta=args.theta,
+                                             stochastic=solver == "stochastic", n_workers=args.vi_workers,
+                                             split=args.split, verbose=verbose)
+        return V, policy, {}
+    if solver == "deterministic":
+        V, policy = value_iteration(maze, gamma=args.gamma, theta=args.theta, verbose=verbose)
+        return V, policy, {}
+    if solver == "stochastic":
+        V, policy = stochastic_value_iteration(maze, gamma=args.gamma, theta=args.theta, verbose=verbose)
+        return V, policy, {}
+
+    from td_learning import QLearningTrainer, SarsaTrainer
+    trainer_class = QLearningTrainer if solver == "q-learning" else SarsaTrainer
+    trainer = trainer_class(maze, n_envs=args.envs, gamma=args.gamma,
+                            max_episode_steps=args.max_steps, seed=args.seed)
+    history = trainer.train(args.train_steps, eval_every=max(1, args.train_steps // 10), verbose=verbose)
+    q_max = trainer.Q.max(axis=1)
+    V = {position: 0 if state.is_terminal else float(q_max[position[0] * maze.width + position[1]])
+         for position, state in maze.states.items()}
+    return V, trainer.greedy_policy(), {"regret": history[-1]["regret"],
+                                        "throughput": history[-1]["throughput"]}
+
 
-    # A. Random Agent Test
-    random_policy = RandomPolicy(maze)
-    random_agent = Agent(maze, random_policy)
+def uses_stochastic_dynamics(maze, solver):
+    """
+    Bepaalt in welke omgeving een policy geëvalueerd wordt: de dynamiek waarvoor hij is opgelost.
 
-    # Simuleer een episode met random agent
-    path, total_reward, steps = random_agent.simulate_episode()
-    print(f"\nRandom Agent Path Length: {steps}")
-    print(f"Random Agent Total Reward: {total_reward}")
+    Zoals in de oorspronkelijke demo draaien de deterministische policy en de
+    random baseline in de deterministische omgeving, de overige in de stochastische.
+    """
+    return solver not in ("deterministic", "random") and maze.slip_probability > 0
 
-    # Visualiseer de random agent episode
-    visualize_episode(maze, path, title=f"Random Agent Path (Reward: {total_reward})")
 
-    # B. Value Iteration (Deterministic)
-    print("\nRunning Value Iteration (Deterministic)...")
-    deterministic_values, deterministic_policy = value_iteration(maze, gamma=1.0, theta=0.01)
+def evaluate_rollouts(maze, policy, stochastic, n_rollouts, n_workers=1, max_steps=100, seed=None):
+    """
+    Simuleert één episode per parallelle omgeving vanaf de startpositie.
 
-    # Visualiseer value function en policy
-    visualize_maze(maze, deterministic_values, deterministic_policy,
-                   title="Deterministic Value Function and Policy")
+    Args:
+        maze: Maze instantie
+        policy: Policy dictionary, of None voor willekeurige acties
+        stochastic: Of de omgeving stochastisch moet zijn
+        n_rollouts: Aantal episodes
+        n_workers: Aantal processen (1 = in-process)
+        max_steps: Maximum aantal stappen per episode
+        seed: Seed voor de omgevingen
 
-    # Test optimal agent
-    optimal_policy = OptimalPolicy(maze, deterministic_policy)
-    optimal_agent = Agent(maze, optimal_policy)
+    Returns:
+        dict: Omgeving, gemiddelde en standaardafwijking van de reward, gemiddelde lengte en succesratio
+    """
+    kwargs = dict(stochastic=stochastic, max_episode_steps=max_steps, seed=seed)
+    if n_workers > 1:
+        env = SubprocVectorMaze(maze, n_rollouts, n_workers=n_workers, **kwargs)
+    else:
+        env = VectorMaze(maze, n_rollouts, **kwargs)
 
-    # Simuleer een episode met optimal agent
-    optimal_path, optimal_reward, optimal_steps = optimal_agent.simulate_episode()
-    print(f"\nOptimal Agent Path Length: {optimal_steps}")
-    print(f"Optimal Agent Total Reward: {optimal_reward}")
+    actions = policy_to_array(maze, policy) if policy is not None else None
+    rng = np.random.default_rng(seed)
 
-    # Visualiseer de optimal agent episode
-    visualize_episode(maze, optimal_path, title=f"Optimal Agent Path (Reward: {optimal_reward})")
+    totals = np.zeros(n_rollouts)
+    lengths = np.zeros(n_rollouts, dtype=np.int64)
+    reached = np.zeros(n_rollouts, dtype=bool)
+    finished = np.zeros(n_rollouts, dtype=bool)
+    try:
+        states, _ = env.reset()
+        while not finished.all():
+            step_actions = actions[states] if actions is not None else rng.integers(0, len(maze.actions), n_rollouts)
+            states, rewards, terminated, truncated, _ = env.step(step_actions)
+            active = ~finished
+            totals[active] += rewards[active]
+            lengths[active] += 1
+            reached |= terminated & active
+            finished |= terminated | truncated
+    finally:
+        env.close()
 
-    # C. Extra Opdracht: Stochastische Omgeving
-    print("\nRunning Value Iteration (Stochastic)...")
-    stochastic_values, stochastic_policy = stochastic_value_iteration(maze, gamma=1.0, theta=0.01)
+    return {
+        "stochastic_env": stochastic,
+        "mean_reward": float(totals.mean()),
+        "std_reward": float(totals.std()),
+        "mean_steps": float(lengths.mean()),
+        "success_rate": float(reached.mean()),
+    }
 
-    # Visualiseer stochastische value function en policy
-    visualize_maze(maze, stochastic_values, stochastic_policy,
-                   title="Stochastic Value Function and Policy")
 
-    # Test stochastic optimal agent
-    stochastic_optimal_policy = OptimalPolicy(maze, stochastic_policy)
-    stochastic_agent = Agent(maze, stochastic_optimal_policy)
+def compare_policy_arrays(maze, policy_a, policy_b):
+    """
+    Vergelijkt twee policies in één gevectoriseerde operatie.
 
-    # Simuleer een episode met stochastic optimal agent (in stochastische omgeving)
-    stoch_path, stoch_reward, stoch_steps = stochastic_agent.simulate_episode(stochastic=True)
-    print(f"\nStochastic Optimal Agent Path Length: {stoch_steps}")
-    print(f"Stochastic Optimal Agent Total Reward: {stoch_reward}")
+    Returns:
+        list: Tuples (positie, actie a, actie b) voor states met een andere optimale actie
+    """
+    actions_a = policy_to_array(maze, policy_a)
+    actions_b = policy_to_array(maze, policy_b)
+    different = np.flatnonzero(actions_a != actions_b)
+    rows, cols = np.divmod(different, maze.width)
+    return [((int(i), int(j)), policy_a[(i, j)], policy_b[(i, j)]) for i, j in zip(rows, cols)]
 
-    # Visualiseer de stochastic agent episode
-    visualize_episode(maze, stoch_path,
-                      title=f"Stochastic Optimal Agent Path (Reward: {stoch_reward})")
 
-    # Vergelijk deterministische en stochastische policies
-    compare_policies(maze, deterministic_values, deterministic_policy,
-                     stochastic_values, stochastic_policy)
+def grid(maze, mapping, convert):
+    """Zet een positie-dictionary om naar een geneste lijst (rij, kolom) voor JSON"""
+    return [[convert(mapping[(i, j)]) for j in range(maze.width)] for i in range(maze.height)]
+
+
+def write_results(path, results):
+    """Schrijft de resultaten als JSON of, voor .csv, als één samenvattingsregel per policy"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if not path.endswith(".csv"):
+        with open(path, "w") as f:
+            json.dump(results, f, indent=2)
+        return
+
+    rows = []
+    for name, solution in results["solutions"].items():
+        row = {**results["config"], "solver": name}
+        row.update(solution.get("stats", {}))
+        row.update(solution["rollouts"])
+        if "comparison" in results and name in ("deterministic", "stochastic"):
+            row["different_actions"] = results["comparison"]["different_actions"]
+        rows.append(row)
+    fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    with open(path, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def plot_results(maze, solutions, args):
+    """Toont de plots; matplotlib wordt pas hier geïmporteerd"""
+    from agent import Agent
+    from policies import OptimalPolicy
+    from visualization import visualize_maze, visualize_episode, compare_policies
+
+    visualize_maze(maze, title="Maze Environment with Rewards")
+    for name, (V, policy, _) in solutions.items():
+        visualize_maze(maze, V, policy, title=f"{name.capitalize()} Value Function and Policy")
+        agent = Agent(maze, OptimalPolicy(maze, policy))
+        path, reward, _ = agent.simulate_episode(max_steps=args.max_steps,
+                                                 stochastic=uses_stochastic_dynamics(maze, name))
+        visualize_episode(maze, path, title=f"{name.capitalize()} Agent Path (Reward: {reward})")
+
+    if "deterministic" in solutions and "stochastic" in solutions:
+        compare_policies(maze, solutions["deterministic"][0], solutions["deterministic"][1],
+                         solutions["stochastic"][0], solutions["stochastic"][1])
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    solvers = SOLVERS if "all" in args.solver else list(dict.fromkeys(args.solver))
+
+    # Seed voor reproduceerbaarheid
+    np.random.seed(args.seed)
+
+    maze = build_maze(args)
+    if not args.quiet:
+        print("Maze Rewards:")
+        print(maze.rewards_grid)
+
+    results = {
+        "config": {
+            "maze": args.maze or (f"generated:{args.generate[0]}x{args.generate[1]}" if args.generate else "default"),
+            "height": maze.height,
+            "width": maze.width,
+            "gamma": args.gamma,
+            "theta": args.theta,
+            "vi_workers": args.vi_workers,
+            "slip_probability": maze.slip_probability,
+            "rollouts": args.rollouts,
+            "seed": args.seed,
+        },
+        "solutions": {},
+    }
+
+    # Baseline: willekeurige agent
+    results["solutions"]["random"] = {
+        "rollouts": evaluate_rollouts(maze, None, uses_stochastic_dynamics(maze, "random"), args.rollouts,
+                                      args.workers, args.max_steps, args.seed),
+    }
+
+    solutions = {}
+    for solver in solvers:
+        if not args.quiet:
+            print(f"\nRunning {solver}...")
+        start = time.perf_counter()
+        V, policy, stats = solve(maze, solver, args)
+        stats["solve_seconds"] = time.perf_counter() - start
+        solutions[solver] = (V, policy, stats)
+
+        results["solutions"][solver] = {
+            "stats": stats,
+            "rollouts": evaluate_rollouts(maze, policy, uses_stochastic_dynamics(maze, solver), args.rollouts,
+                                          args.workers, args.max_steps, args.seed),
+            "values": grid(maze, V, float),
+            "policy": grid(maze, policy, lambda action: action.name if action is not None else None),
+        }
+
+    if not args.quiet:
+        for name, solution in results["solutions"].items():
+            rollouts = solution["rollouts"]
+            print(f"\n{name} Agent Mean Reward: {rollouts['mean_reward']:.2f} "
+                  f"(std {rollouts['std_reward']:.2f}), Mean Steps: {rollouts['mean_steps']:.1f}, "
+                  f"Success Rate: {rollouts['success_rate']:.2%}")
 
     # Analyse van de verschillen
-    print("\nAnalyse van verschillen tussen deterministische en stochastische omgeving:")
-    different_actions = 0
-    for i in range(maze.height):
-        for j in range(maze.width):
-            position = (i, j)
-            state = maze.get_state(position)
-            if not state.is_terminal:
-                if deterministic_policy[position] != stochastic_policy[position]:
-                    different_actions += 1
-                    det_action = deterministic_policy[position].name
-                    stoch_action = stochastic_policy[position].name
-                    print(f"State {position}: Deterministic: {det_action}, Stochastic: {stoch_action}")
-
-    print(
-        f"Aantal states met andere optimale acties: {different_actions} van de {maze.width * maze.height - len(maze.terminal_positions)}")
+    if "deterministic" in solutions and "stochastic" in solutions:
+        differences = compare_policy_arrays(maze, solutions["deterministic"][1], solutions["stochastic"][1])
+        non_terminal = maze.width * maze.height - len(maze.terminal_positions)
+        results["comparison"] = {
+            "different_actions": len(differences),
+            "non_terminal_states": non_terminal,
+            "positions": [[list(position), det.name, stoch.name] for position, det, stoch in differences],
+        }
+        if not args.quiet:
+            print("\nAnalyse van verschillen tussen deterministische en stochastische omgeving:")
+            for position, det_action, stoch_action in differences:
+                print(f"State {position}: Deterministic: {det_action.name}, Stochastic: {stoch_action.name}")
+            print(f"Aantal states met andere optimale acties: {len(differences)} van de {non_terminal}")
+
+    if args.output:
+        write_results(args.output, results)
+
+    if args.plot:
+        plot_results(maze, solutions, args)
+
+    return results
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,4 +1,5 @@
 import numpy as np
+import json
 from enum import Enum
 
 
@@ -35,27 +36,51 @@ class State:
 
 
 class Maze:
-    def __init__(self):
+    def __init__(self, rewards_grid=None, terminal_positions=None, start_position=None,
+                 slip_probability=0.3):
+        """
+        Initialiseert de maze; zonder rewards_grid wordt de standaard 4x4 maze gebruikt.
+
+        Args:
+            rewards_grid: 2D array met de reward voor elke positie (rij, kolom)
+            terminal_positions: Lijst van terminal posities (verplicht bij een eigen rewards_grid)
+            start_position: Startpositie (rij, kolom) (verplicht bij een eigen rewards_grid)
+            slip_probability: Kans dat in de stochastische omgeving een andere actie wordt uitgevoerd
+        """
+        # Rewards voor elke positie (rij, kolom)
+        if rewards_grid is None:
+            rewards_grid = [
+                [-1, -1, -1, 40],  # Bovenste rij
+                [-1, -1, -10, -10],  # Tweede rij
+                [-1, -1, -1, -1],  # Derde rij
+                [10, -2, -1, -1]  # Onderste rij
+            ]
+            if terminal_positions is None:
+                terminal_positions = [(0, 3), (3, 0)]
+            if start_position is None:
+                start_position = (3, 2)
+        elif terminal_positions is None or start_position is None:
+            raise ValueError("Een eigen rewards_grid vereist terminal_positions en start_position")
+        self.rewards_grid = np.array(rewards_grid)
+        if self.rewards_grid.ndim != 2:
+            raise ValueError("rewards_grid moet een 2D grid zijn")
+
         # Grid afmetingen
-        self.height = 4
-        self.width = 4
+        self.height, self.width = self.rewards_grid.shape
 
         # Acties als Enum
         self.actions = [a for a in Actions]
 
-        # Rewards voor elke positie (rij, kolom)
-        self.rewards_grid = np.array([
-            [-1, -1, -1, 40],  # Bovenste rij
-            [-1, -1, -10, -10],  # Tweede rij
-            [-1, -1, -1, -1],  # Derde rij
-            [10, -2, -1, -1]  # Onderste rij
-        ])
-
         # Terminal positions
-        self.terminal_positions = [(0, 3), (3, 0)]
+        self.terminal_positions = [tuple(p) for p in terminal_positions]
+        for position in self.terminal_positions:
+            self._check_position(position, "Terminal positie")
 
         # Start position
-        self.start_position = (3, 2)
+        self.start_position = tuple(start_position)
+        self._check_position(self.start_position, "Startpositie")
+
+        self.slip_probability = slip_probability
 
         # Verzameling van states (gevraagd in de opdracht)
         self.states = {}
@@ -66,6 +91,11 @@ class Maze:
                 is_terminal = position in self.terminal_positions
                 self.states[position] = State(position, reward, is_terminal)
 
+    def _check_position(self, position, label):
+        """Controleert of een positie binnen het grid valt"""
+        if len(position) != 2 or not (0 <= position[0] < self.height and 0 <= position[1] < self.width):
+            raise ValueError(f"{label} {position} ligt buiten het {self.height}x{self.width} grid")
+
     def get_state(self, position):
         """Haalt een state object op basis van positie"""
         return self.states[position]
@@ -101,7 +131,7 @@ class Maze:
         Args:
             position: Huidige positie (rij, kolom)
             action: Te ondernemen actie (Actions enum)
-            stochastic: Of de omgeving stochastisch moet zijn (70% kans op gekozen actie)
+            stochastic: Of de omgeving stochastisch moet zijn (kans slip_probability op een andere actie)
 
         Returns:
             tuple: (volgende positie, reward, done)
@@ -109,14 +139,14 @@ class Maze:
         if not stochastic:
             return self.deterministic_step(position, action)
 
-        # Stochastische uitvoering: 70% kans op gekozen actie, 30% verdeeld over andere richtingen
+        # Stochastische uitvoering: standaard 70% kans op gekozen actie, 30% verdeeld over andere richtingen
         p = np.zeros(len(self.actions))
-        p[action.value] = 0.7  # 70% kans op gekozen actie
+        p[action.value] = 1 - self.slip_probability
 
-        # Verdeel overige 30% over andere acties
+        # Verdeel de slip-kans over andere acties
         other_actions = [a for a in self.actions if a != action]
         for a in other_actions:
-            p[a.value] = 0.3 / len(other_actions)
+            p[a.value] = self.slip_probability / len(other_actions)
 
         # Kies actie volgens de kansverdelingen
         action_values = [a.value for a in self.actions]
@@ -131,3 +161,82 @@ class Maze:
         done = self.is_terminal(next_position)
 
         return next_position, reward, done
+
+    def transition_arrays(self):
+        """
+        Zet de deterministische dynamiek om naar NumPy arrays.
+
+        States worden genummerd als rij * width + kolom.
+
+        Returns:
+            tuple: (next_states [S, A], rewards [S, A], terminal [S])
+        """
+        rows, cols = np.divmod(np.arange(self.height * self.width), self.width)
+
+        # Zelfde bewegingen als get_next_position, maar voor alle states tegelijk
+        moves = {
+            Actions.LEFT: (rows, np.maximum(0, cols - 1)),
+            Actions.UP: (np.maximum(0, rows - 1), cols),
+            Actions.RIGHT: (rows, np.minimum(self.width - 1, cols + 1)),
+            Actions.DOWN: (np.minimum(self.height - 1, rows + 1), cols),
+        }
+        next_states = np.stack([moves[a][0] * self.width + moves[a][1] for a in self.actions], axis=1)
+        rewards = self.rewards_grid.ravel()[next_states].astype(float)
+
+        terminal = np.zeros(self.height * self.width, dtype=bool)
+        for i, j in self.terminal_positions:
+            terminal[i * self.width + j] = True
+
+        return next_states, rewards, terminal
+
+
+def load_maze(path):
+    """
+    Laadt een maze uit een JSON bestand.
+
+    Het bestand bevat "rewards" (2D lijst), "terminal_positions",
+    "start_position" en optioneel "slip_probability".
+
+    Args:
+        path: Pad naar het JSON bestand
+
+    Returns:
+        Maze: De geladen maze
+    """
+    with open(path) as f:
+        config = json.load(f)
+    missing = [key for key in ("rewards", "terminal_positions", "start_position") if key not in config]
+    if missing:
+        raise ValueError(f"{path}: ontbrekende velden {', '.join(missing)}")
+    return Maze(config["rewards"], config["terminal_positions"], config["start_position"],
+                config.get("slip_probability", 0.3))
+
+
+def generate_maze(height, width, pit_probability=0.1, slip_probability=0.3, seed=None):
+    """
+    Genereert een willekeurige maze in de stijl van de standaard maze.
+
+    Rechtsboven ligt een terminal met reward 40, linksonder een terminal met
+    reward 10; overige cellen kosten -1 of zijn met kans `pit_probability` een put (-10).
+
+    Args:
+        height: Aantal rijen
+        width: Aantal kolommen
+        pit_probability: Kans dat een cel een put is
+        slip_probability: Kans dat in de stochastische omgeving een andere actie wordt uitgevoerd
+        seed: Seed voor de random generator
+
+    Returns:
+        Maze: De gegenereerde maze
+    """
+    rng = np.random.default_rng(seed)
+    rewards = np.where(rng.random((height, width)) < pit_probability, -10, -1)
+    terminal_positions = [(0, width - 1), (height - 1, 0)]
+    rewards[0, width - 1] = 40
+    rewards[height - 1, 0] = 10
+
+    # Start op een willekeurige niet-terminal positie
+    candidates = [(i, j) for i in range(height) for j in range(width) if (i, j) not in terminal_positions]
+    start_position = candidates[rng.integers(len(candidates))]
+
+    return Maze(rewards, terminal_positions, start_position, slip_probability)
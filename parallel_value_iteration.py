@@ -0,0 +1,184 @@
+import multiprocessing as mp
+
+import numpy as np
+
+
+def _block_states(maze, split, n_blocks):
+    """
+    Verdeelt de states van het grid in blokken van aaneengesloten rijen of kolommen.
+
+    Returns:
+        list: Per blok een array met state ids (rij * width + kolom)
+    """
+    rows, cols = np.meshgrid(np.arange(maze.height), np.arange(maze.width), indexing="ij")
+    ids = rows * maze.width + cols
+    if split == "columns":
+        ids = ids.T
+    elif split != "rows":
+        raise ValueError(f"Onbekende split: {split}")
+    return [block.ravel() for block in np.array_split(ids, n_blocks) if block.size]
+
+
+def _backup(q, slip_probability, stochastic):
+    """
+    Bellman backup over alle acties.
+
+    Args:
+        q: Array [A, N] met reward + gamma * V(volgende state) per actie
+        slip_probability: Kans dat een andere actie dan de gekozen wordt uitgevoerd
+        stochastic: Of de stochastische dynamiek gebruikt moet worden
+
+    Returns:
+        np.ndarray: Verwachte waarde per (gekozen actie, state), shape [A, N]
+    """
+    if not stochastic:
+        return q
+    other = slip_probability / (q.shape[0] - 1)
+    return (1 - slip_probability - other) * q + other * q.sum(axis=0)
+
+
+def _sweep_block(shared_V, deltas, barrier, index, block, next_states, rewards, terminal,
+                 gamma, theta, slip_probability, stochastic, verbose):
+    """
+    Voert value iteration uit op één blok tot de globale delta onder theta zit.
+
+    Het blok houdt een lokale kopie bij van zijn eigen states plus een halo:
+    de states buiten het blok die in één stap bereikbaar zijn. Elke sweep:
+
+        1. backup van het blok op basis van de lokale kopie (Jacobi)
+        2. blok en lokale delta naar shared memory schrijven
+        3. barrier, globale delta = max over alle blokken
+        4. halo verversen uit shared memory
+        5. barrier, zodat niemand shared V overschrijft voordat iedereen gelezen heeft
+    """
+    V = np.frombuffer(shared_V, dtype=np.float64)
+    delta_array = np.frombuffer(deltas, dtype=np.float64)
+
+    # Halo: bereikbare states buiten het blok
+    reachable = np.zeros(len(V), dtype=bool)
+    reachable[next_states[block]] = True
+    reachable[block] = False
+    halo = np.flatnonzero(reachable)
+    local_ids = np.concatenate([block, halo])
+    to_local = np.full(len(V), -1, dtype=np.int64)
+    to_local[local_ids] = np.arange(len(local_ids))
+
+    # Actie-major layout [A, N], zodat de reductie over acties over aaneengesloten rijen loopt
+    block_next = np.ascontiguousarray(to_local[next_states[block]].T)
+    block_rewards = np.ascontiguousarray(rewards[block].T)
+    active = ~terminal[block]
+    local = V[local_ids].copy()
+    n_block = len(block)
+
+    iteration = 0
+    while True:
+        iteration += 1
+        q = block_rewards + gamma * local[block_next]
+        new_values = np.where(active, _backup(q, slip_probability, stochastic).max(axis=0), 0.0)
+        delta_array[index] = np.abs(new_values - local[:n_block]).max(initial=0.0)
+        local[:n_block] = new_values
+        V[block] = new_values
+
+        if barrier is not None:
+            barrier.wait()
+        delta = delta_array.max()
+        if verbose and index == 0:
+            print(f"Parallel Iteration {iteration}, Delta: {delta:.6f}")
+        if delta < theta:
+            break
+
+        local[n_block:] = V[halo]
+        if barrier is not None:
+            barrier.wait()
+
+
+def _worker(shared_V, deltas, barrier, *args):
+    """Draait een blok in een subprocess; breekt bij een fout de barrier zodat andere blokken stoppen"""
+    try:
+        _sweep_block(shared_V, deltas, barrier, *args)
+    except BaseException:
+        barrier.abort()
+        raise
+
+
+def _join_workers(processes, barrier, poll_interval=0.1):
+    """
+    Wacht op alle workers en stopt ze zodra er één faalt.
+
+    Een worker die van buitenaf gekilld wordt kan de barrier zelf niet meer
+    breken; daarom pollt de parent en breekt hij de barrier in dat geval.
+
+    Raises:
+        RuntimeError: Als een worker met een exitcode ongelijk aan 0 stopt
+    """
+    pending = list(processes)
+    while pending:
+        pending[0].join(poll_interval)
+        pending = [process for process in pending if process.exitcode is None]
+        failed = [process.exitcode for process in processes if process.exitcode not in (None, 0)]
+        if failed:
+            barrier.abort()
+            raise RuntimeError(f"Value iteration worker gefaald met exitcode {failed[0]}")
+
+
+def parallel_value_iteration(maze, gamma=1.0, theta=0.01, stochastic=False, n_workers=None,
+                             split="rows", verbose=True):
+    """
+    Voert value iteration uit met het grid verdeeld over meerdere processen.
+
+    Elk proces werkt een blok rijen of kolommen bij in een gedeelde V array
+    en wisselt na elke sweep de randwaarden (halo) uit met zijn buren. De
+    stopconditie gebruikt de maximale delta over alle blokken. Omdat alle
+    blokken op de waarden van de vorige sweep werken (Jacobi) kan het aantal
+    iteraties iets afwijken van de in-place versies, maar het vaste punt is hetzelfde.
+
+    Args:
+        maze: De maze omgeving
+        gamma: Discount factor
+        theta: Convergentie threshold
+        stochastic: Of de stochastische dynamiek (maze.slip_probability) gebruikt moet worden
+        n_workers: Aantal processen (standaard aantal CPU cores); 1 draait in-process
+        split: "rows" of "columns"
+        verbose: Of de delta per iteratie geprint moet worden
+
+    Returns:
+        tuple: (V: value function dictionary, policy: optimal policy dictionary)
+    """
+    next_states, rewards, terminal = maze.transition_arrays()
+    n_lines = maze.height if split == "rows" else maze.width
+    n_workers = max(1, min(n_workers or mp.cpu_count(), n_lines))
+    blocks = _block_states(maze, split, n_workers)
+
+    shared_V = mp.RawArray("d", len(terminal))
+    deltas = mp.RawArray("d", len(blocks))
+    args = (next_states, rewards, terminal, gamma, theta, maze.slip_probability, stochastic, verbose)
+
+    if len(blocks) == 1:
+        _sweep_block(shared_V, deltas, None, 0, blocks[0], *args)
+    else:
+        barrier = mp.Barrier(len(blocks))
+        processes = [mp.Process(target=_worker, args=(shared_V, deltas, barrier, index, block, *args))
+                     for index, block in enumerate(blocks)]
+        for process in processes:
+            process.start()
+        try:
+            _join_workers(processes, barrier)
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                    process.join()
+
+    values = np.frombuffer(shared_V, dtype=np.float64).copy()
+
+    # Bepaal optimale policy
+    q = _backup((rewards + gamma * values[next_states]).T, maze.slip_probability, stochastic)
+    best_actions = q.argmax(axis=0)
+
+    V = {}
+    policy = {}
+    for (i, j), state in maze.states.items():
+        s = i * maze.width + j
+        V[(i, j)] = float(values[s])
+        policy[(i, j)] = None if state.is_terminal else maze.actions[best_actions[s]]
+    return V, policy
@@ -64,4 +64,24 @@ class OptimalPolicy(Policy):
         if position in self.policy_dict and self.policy_dict[position] is not None:
             return self.policy_dict[position]
         # Fallback naar willekeurige actie als positie niet in policy zit
-        return np.random.choice(self.maze.actions)
\ No newline at end of file
+        return np.random.choice(self.maze.actions)
+
+
+def policy_to_array(maze, policy_dict):
+    """
+    Zet een policy dictionary om naar een actie-array per state.
+
+    States worden genummerd als rij * width + kolom, zoals in Maze.transition_arrays.
+
+    Args:
+        maze: Maze instantie
+        policy_dict: Dictionary met key=positie, value=beste actie (of None)
+
+    Returns:
+        np.ndarray: Actie-waarde per state, -1 voor states zonder actie
+    """
+    actions = np.full(maze.height * maze.width, -1, dtype=np.int64)
+    for (i, j), action in policy_dict.items():
+        if action is not None:
+            actions[i * maze.width + j] = action.value
+    return actions
@@ -0,0 +1,369 @@
+import argparse
+import asyncio
+import json
+import struct
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from maze import Maze, Actions
+from value_iteration import value_iteration, stochastic_value_iteration
+
+# Elk bericht is een 4-byte big-endian lengte gevolgd door een JSON body
+HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 1 << 20
+
+
+async def read_message(reader):
+    """
+    Leest een length-prefixed JSON bericht van een stream.
+
+    Args:
+        reader: asyncio.StreamReader
+
+    Returns:
+        dict: Het gedecodeerde bericht, of None als de verbinding gesloten is
+    """
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = HEADER.unpack(header)
+    if length > MAX_MESSAGE_SIZE:
+        raise ValueError(f"Bericht te groot: {length} bytes")
+    body = await reader.readexactly(length)
+    return json.loads(body)
+
+
+def write_message(writer, message):
+    """
+    Schrijft een length-prefixed JSON bericht naar een stream.
+
+    Args:
+        writer: asyncio.StreamWriter
+        message: Dictionary die als JSON verstuurd wordt
+    """
+    body = json.dumps(message).encode()
+    writer.write(HEADER.pack(len(body)) + body)
+
+
+def is_valid_position(position, height, width):
+    """
+    Controleert of een positie een lijst of tuple van twee integers binnen het grid is.
+
+    Args:
+        position: Positie uit een bericht (rij, kolom)
+        height: Aantal rijen van het grid
+        width: Aantal kolommen van het grid
+    """
+    return (isinstance(position, (list, tuple)) and len(position) == 2
+            and all(isinstance(x, int) and not isinstance(x, bool) for x in position)
+            and 0 <= position[0] < height and 0 <= position[1] < width)
+
+
+class PolicyTable:
+    """Onveranderlijke array-representatie van een opgeloste policy"""
+
+    def __init__(self, maze, policy_dict, version=0):
+        """
+        Zet een policy dictionary om naar een NumPy array.
+
+        Args:
+            maze: Maze instantie
+            policy_dict: Dictionary met key=positie, value=beste actie (of None)
+            version: Versienummer van deze policy
+        """
+        self.height = maze.height
+        self.width = maze.width
+        self.version = version
+
+        # -1 betekent: geen actie (terminal state of onbekende positie)
+        self.actions = np.full((maze.height, maze.width), -1, dtype=np.int8)
+        for (i, j), action in policy_dict.items():
+            if action is not None:
+                self.actions[i, j] = action.value
+
+    def lookup(self, rows, cols):
+        """
+        Zoekt de acties voor een batch posities in één gevectoriseerde lookup.
+
+        Args:
+            rows: NumPy array met rij-indices
+            cols: NumPy array met kolom-indices
+
+        Returns:
+            np.ndarray: Actie-waarden per positie, -1 voor ongeldige posities
+        """
+        valid = (rows >= 0) & (rows < self.height) & (cols >= 0) & (cols < self.width)
+        result = np.full(rows.shape, -1, dtype=np.int8)
+        result[valid] = self.actions[rows[valid], cols[valid]]
+        return result
+
+
+class LatencyStats:
+    """Houdt de latency van de laatste requests bij"""
+
+    def __init__(self, window=10000):
+        """
+        Args:
+            window: Aantal recente metingen waarover percentielen berekend worden
+        """
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.batches = 0
+
+    def record(self, latencies):
+        """Voegt een batch latencies (in seconden) toe"""
+        self.samples.extend(latencies)
+        self.count += len(latencies)
+        self.batches += 1
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Aantal requests, gemiddelde batchgrootte en p50/p99 latency in ms
+        """
+        if not self.samples:
+            return {"requests": 0, "batches": 0, "mean_batch": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+        p50, p99 = np.percentile(np.fromiter(self.samples, dtype=float), [50, 99]) * 1000
+        return {
+            "requests": self.count,
+            "batches": self.batches,
+            "mean_batch": self.count / self.batches,
+            "p50_ms": float(p50),
+            "p99_ms": float(p99),
+        }
+
+
+class PolicyServer:
+    """Asyncio TCP server die "beste actie" queries in micro-batches beantwoordt"""
+
+    def __init__(self, maze, policy_dict, max_batch=256, max_wait=0.001):
+        """
+        Initialiseert de server.
+
+        Args:
+            maze: Maze instantie
+            policy_dict: Dictionary met key=positie, value=beste actie
+            max_batch: Maximaal aantal queries per batch
+            max_wait: Maximale wachttijd (seconden) om een batch te vullen
+        """
+        self.maze = maze
+        self.table = PolicyTable(maze, policy_dict)
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.stats = LatencyStats()
+        self._queue = None
+        self._server = None
+        self._batcher = None
+        self._solver_pool = None
+        self._clients = {}
+
+    def swap_policy(self, maze, policy_dict):
+        """
+        Vervangt de actieve policy zonder downtime.
+
+        De nieuwe tabel wordt eerst volledig opgebouwd en daarna in één
+        toewijzing actief gemaakt; lopende batches gebruiken de oude tabel.
+
+        Args:
+            maze: Maze instantie waarop de policy is opgelost
+            policy_dict: Dictionary met key=positie, value=beste actie
+
+        Returns:
+            int: Versienummer van de nieuwe policy
+        """
+        self.maze = maze
+        self.table = PolicyTable(maze, policy_dict, version=self.table.version + 1)
+        return self.table.version
+
+    async def resolve(self, stochastic=False, gamma=1.0, theta=0.01):
+        """
+        Lost de maze opnieuw op in een apart proces en wisselt daarna de policy.
+
+        De solvers zijn pure Python en houden de GIL vast; in een thread zouden
+        ze de event loop tijdens het hele oplossen blokkeren.
+
+        Returns:
+            int: Versienummer van de nieuwe policy
+        """
+        if self._solver_pool is None:
+            self._solver_pool = ProcessPoolExecutor(max_workers=1)
+        solver = stochastic_value_iteration if stochastic else value_iteration
+        loop = asyncio.get_running_loop()
+        _, policy = await loop.run_in_executor(self._solver_pool, solver, self.maze, gamma, theta, False)
+        return self.swap_policy(self.maze, policy)
+
+    async def start(self, host="127.0.0.1", port=0):
+        """
+        Start de server en de batch-coroutine.
+
+        Returns:
+            tuple: (host, poort) waarop de server luistert
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.create_task(self._batch_loop())
+        self._server = await asyncio.start_server(self._handle_client, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def stop(self):
+        """Stopt de server, de batch-coroutine en het solver-proces"""
+        if self._server is not None:
+            self._server.close()
+            # Open verbindingen sluiten, zodat hun handlers netjes eindigen
+            for writer in self._clients.values():
+                writer.close()
+            await asyncio.gather(*self._clients, return_exceptions=True)
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+        if self._solver_pool is not None:
+            self._solver_pool.shutdown()
+            self._solver_pool = None
+
+    async def query(self, position):
+        """
+        Zet een positie in de wachtrij en wacht op de actie.
+
+        Args:
+            position: Positie (rij, kolom)
+
+        Returns:
+            tuple: (Actions of None, policy versie)
+        """
+        if not is_valid_position(position, self.table.height, self.table.width):
+            raise ValueError(f"Ongeldige positie: {position!r}")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((tuple(position), future, time.perf_counter()))
+        return await future
+
+    async def _batch_loop(self):
+        """Verzamelt gelijktijdige queries en beantwoordt ze met één lookup"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                # Eerst alles pakken wat al klaarstaat, dan kort wachten op meer
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Per item controleren tegen de actieve tabel (die kan sinds het
+            # queuen gewisseld zijn), zodat één ongeldige query de rest van de batch niet raakt
+            table = self.table
+            valid = []
+            for position, future, start in batch:
+                if is_valid_position(position, table.height, table.width):
+                    valid.append((position, future, start))
+                elif not future.done():
+                    future.set_exception(ValueError(f"Ongeldige positie: {position!r}"))
+            if not valid:
+                continue
+
+            try:
+                positions = np.array([item[0] for item in valid], dtype=np.int64)
+                actions = table.lookup(positions[:, 0], positions[:, 1])
+            except Exception as error:
+                # Een fout in de lookup mag de batch-coroutine niet stoppen
+                for _, future, _ in valid:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+
+            now = time.perf_counter()
+            for (_, future, _), action in zip(valid, actions):
+                if not future.done():
+                    future.set_result((Actions(int(action)) if action >= 0 else None, table.version))
+            self.stats.record([now - item[2] for item in valid])
+
+    async def _handle_client(self, reader, writer):
+        """Verwerkt berichten van één client tot de verbinding sluit"""
+        task = asyncio.current_task()
+        self._clients[task] = writer
+        try:
+            while True:
+                message = await read_message(reader)
+                if message is None:
+                    break
+                write_message(writer, await self._dispatch(message))
+                await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            self._clients.pop(task, None)
+            writer.close()
+
+    async def _dispatch(self, message):
+        """Handelt één bericht af; fouten worden als {"error": ...} beantwoord"""
+        try:
+            return await self._handle_message(message)
+        except Exception as error:
+            return {"error": f"{type(error).__name__}: {error}"}
+
+    async def _handle_message(self, message):
+        """
+        Voert de operatie uit een bericht uit.
+
+        Ondersteunde operaties:
+            action: {"op": "action", "position": [rij, kolom]}
+            stats: {"op": "stats"}
+            reload: {"op": "reload", "stochastic": bool}
+        """
+        if not isinstance(message, dict):
+            return {"error": "Bericht moet een JSON object zijn"}
+        op = message.get("op")
+        if op == "action":
+            position = message.get("position")
+            if not is_valid_position(position, self.table.height, self.table.width):
+                return {"error": f"Ongeldige positie: {position!r}"}
+            action, version = await self.query(position)
+            return {"action": action.name if action is not None else None, "version": version}
+        if op == "stats":
+            return {**self.stats.snapshot(), "version": self.table.version}
+        if op == "reload":
+            version = await self.resolve(stochastic=message.get("stochastic", False))
+            return {"version": version}
+        return {"error": f"Onbekende operatie: {op}"}
+
+
+async def serve(host, port, stochastic, max_batch, max_wait):
+    """Lost de maze op en serveert de policy tot de server onderbroken wordt"""
+    maze = Maze()
+    solver = stochastic_value_iteration if stochastic else value_iteration
+    _, policy = solver(maze, gamma=1.0, theta=0.01, verbose=False)
+
+    server = PolicyServer(maze, policy, max_batch=max_batch, max_wait=max_wait)
+    host, port = await server.start(host, port)
+    print(f"Policy server luistert op {host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serveer een opgeloste maze policy via TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stochastic", action="store_true", help="Gebruik stochastische value iteration")
+    parser.add_argument("--max-batch", type=int, default=256)
+    parser.add_argument("--max-wait", type=float, default=0.001, help="Maximale batch-wachttijd in seconden")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(serve(args.host, args.port, args.stochastic, args.max_batch, args.max_wait))
+    except KeyboardInterrupt:
+        pass
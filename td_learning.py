@@ -0,0 +1,319 @@
+import time
+
+import numpy as np
+from maze import Actions
+
+
+def linear_schedule(start, end, duration):
+    """
+    Maakt een lineair afnemend schema (bijv. voor epsilon of learning rate).
+
+    Args:
+        start: Beginwaarde
+        end: Eindwaarde, aangehouden na `duration` stappen
+        duration: Aantal stappen waarover de waarde afneemt
+
+    Returns:
+        callable: Functie t -> waarde
+    """
+    def schedule(t):
+        fraction = min(1.0, t / max(1, duration))
+        return start + fraction * (end - start)
+    return schedule
+
+
+def expected_action_values(next_states, rewards, terminal, V, gamma=1.0, slip_probability=0.3):
+    """
+    Bellman backup onder de stochastische dynamiek voor alle (state, actie) paren.
+
+    Args:
+        next_states: Array [S, A] met volgende states
+        rewards: Array [S, A] met rewards
+        terminal: Boolean array [S] met terminal states
+        V: Array [S] met de huidige values
+        gamma: Discount factor
+        slip_probability: Kans dat een andere actie dan de gekozen wordt uitgevoerd
+
+    Returns:
+        np.ndarray: Verwachte waarde per (state, gekozen actie), 0 voor terminal states
+    """
+    n_actions = rewards.shape[1]
+    other = slip_probability / (n_actions - 1)
+    q = rewards + gamma * V[next_states]
+    expected = (1.0 - slip_probability - other) * q + other * q.sum(axis=1, keepdims=True)
+    expected[terminal] = 0
+    return expected
+
+
+def evaluate_policy(next_states, rewards, terminal, actions, gamma=1.0, slip_probability=0.3,
+                    theta=1e-6, horizon=None):
+    """
+    Evalueert een deterministische policy onder de stochastische dynamiek.
+
+    Met gamma=1 heeft een policy die nooit een terminal state bereikt geen
+    eindige waarde; geef dan een `horizon` mee (bijv. max_episode_steps) om de
+    verwachte reward over hoogstens zoveel stappen te berekenen.
+
+    Args:
+        next_states: Array [S, A] met volgende states
+        rewards: Array [S, A] met rewards
+        terminal: Boolean array [S] met terminal states
+        actions: Array [S] met de actie per state (waarde voor terminal states wordt genegeerd)
+        gamma: Discount factor
+        slip_probability: Kans dat een andere actie dan de gekozen wordt uitgevoerd
+        theta: Convergentie threshold
+        horizon: Maximum aantal stappen (None = tot convergentie)
+
+    Returns:
+        np.ndarray: Value per state
+    """
+    states = np.arange(len(terminal))
+    V = np.zeros(len(terminal))
+    sweeps = 0
+    while horizon is None or sweeps < horizon:
+        sweeps += 1
+        new_V = expected_action_values(next_states, rewards, terminal, V, gamma, slip_probability)[states, actions]
+        delta = np.abs(new_V - V).max()
+        V = new_V
+        if delta < theta:
+            break
+    return V
+
+
+def optimal_actions(next_states, rewards, terminal, gamma=1.0, slip_probability=0.3, theta=0.01):
+    """
+    Gevectoriseerde stochastische value iteration over de transitie-arrays.
+
+    Lost hetzelfde probleem op als stochastic_value_iteration, maar met één
+    array-backup per sweep in plaats van een Python-lus over alle states.
+
+    Returns:
+        np.ndarray: Optimale actie per state
+    """
+    V = np.zeros(len(terminal))
+    while True:
+        new_V = expected_action_values(next_states, rewards, terminal, V, gamma, slip_probability).max(axis=1)
+        delta = np.abs(new_V - V).max()
+        V = new_V
+        if delta < theta:
+            break
+    return expected_action_values(next_states, rewards, terminal, V, gamma, slip_probability).argmax(axis=1)
+
+
+class TDTrainer:
+    """Basisklasse voor gevectoriseerde tabulaire TD-learning op de maze"""
+
+    def __init__(self, maze, n_envs=4096, gamma=1.0, epsilon=None, alpha=None,
+                 slip_probability=None, max_episode_steps=100, seed=None):
+        """
+        Initialiseert de trainer.
+
+        De slip-kans wordt alleen gebruikt om de omgeving te simuleren en voor
+        de regret-evaluatie; de updates zelf zijn model-vrij.
+
+        Args:
+            maze: Maze instantie
+            n_envs: Aantal omgevingen dat in lockstep gesimuleerd wordt
+            gamma: Discount factor
+            epsilon: Schema t -> epsilon (standaard lineair van 1.0 naar 0.05)
+            alpha: Schema t -> learning rate (standaard lineair van 0.5 naar 0.05)
+            slip_probability: Kans dat een andere actie dan de gekozen wordt uitgevoerd
+                (standaard maze.slip_probability)
+            max_episode_steps: Episodes worden na dit aantal stappen afgebroken
+            seed: Seed voor de random generator
+        """
+        self.maze = maze
+        self.next_states, self.rewards, self.terminal = maze.transition_arrays()
+        n_states, n_actions = self.rewards.shape
+
+        self.n_envs = n_envs
+        self.gamma = gamma
+        self.epsilon = epsilon or linear_schedule(1.0, 0.05, 200)
+        self.alpha = alpha or linear_schedule(0.5, 0.05, 500)
+        self.slip_probability = maze.slip_probability if slip_probability is None else slip_probability
+        self.max_episode_steps = max_episode_steps
+        self.rng = np.random.default_rng(seed)
+
+        self.Q = np.zeros((n_states, n_actions))
+        self.start_states = np.flatnonzero(~self.terminal)
+        self.states = self._reset_states(n_envs)
+        self.episode_steps = np.zeros(n_envs, dtype=np.int64)
+        self.t = 0
+
+        # Referentie: stochastic value iteration met het echte model
+        self.optimal_actions = optimal_actions(self.next_states, self.rewards, self.terminal,
+                                               gamma, self.slip_probability)
+        self.optimal_values = evaluate_policy(self.next_states, self.rewards, self.terminal,
+                                              self.optimal_actions, gamma, self.slip_probability,
+                                              horizon=max_episode_steps)
+
+    def _reset_states(self, n):
+        """Kiest willekeurige niet-terminal beginstates (exploring starts)"""
+        return self.rng.choice(self.start_states, size=n)
+
+    def select_actions(self, states, epsilon):
+        """
+        Epsilon-greedy actiekeuze voor een batch states.
+
+        Args:
+            states: Array met state ids
+            epsilon: Kans op een willekeurige actie
+
+        Returns:
+            np.ndarray: Gekozen acties
+        """
+        greedy = self.Q[states].argmax(axis=1)
+        explore = self.rng.random(len(states)) < epsilon
+        return np.where(explore, self.rng.integers(0, self.Q.shape[1], len(states)), greedy)
+
+    def _sample_transitions(self, states, actions):
+        """Voert de gekozen acties uit met kans op uitglijden naar een andere richting"""
+        n_actions = self.Q.shape[1]
+        slipped = self.rng.random(len(states)) < self.slip_probability
+        offset = self.rng.integers(1, n_actions, len(states))
+        actual = np.where(slipped, (actions + offset) % n_actions, actions)
+        next_states = self.next_states[states, actual]
+        return next_states, self.rewards[states, actual], self.terminal[next_states]
+
+    def _targets(self, rewards, next_states, done, epsilon):
+        """
+        Berekent de TD-targets voor een batch transities.
+
+        Returns:
+            tuple: (targets, volgende acties of None)
+        """
+        raise NotImplementedError("Implementeer deze methode in afgeleide klassen")
+
+    def _update(self, states, actions, targets, alpha):
+        """
+        Past alle TD-fouten van één stap in één keer toe.
+
+        Transities met dezelfde (state, actie) worden gemiddeld, zodat het
+        aantal omgevingen de effectieve stapgrootte niet vergroot.
+        """
+        n_actions = self.Q.shape[1]
+        index = states * n_actions + actions
+        errors = targets - self.Q.ravel()[index]
+        size = self.Q.size
+        error_sum = np.bincount(index, weights=errors, minlength=size)
+        counts = np.bincount(index, minlength=size)
+        visited = counts > 0
+        self.Q.ravel()[visited] += alpha * error_sum[visited] / counts[visited]
+
+    def step(self, actions=None):
+        """
+        Voert één lockstep-stap uit in alle omgevingen.
+
+        Args:
+            actions: Acties voor de huidige states (standaard epsilon-greedy)
+
+        Returns:
+            np.ndarray: Acties voor de volgende stap (alleen SARSA), anders None
+        """
+        epsilon = self.epsilon(self.t)
+        alpha = self.alpha(self.t)
+        if actions is None:
+            actions = self.select_actions(self.states, epsilon)
+
+        next_states, rewards, done = self._sample_transitions(self.states, actions)
+        targets, next_actions = self._targets(rewards, next_states, done, epsilon)
+        self._update(self.states, actions, targets, alpha)
+
+        # Auto-reset van afgelopen of afgebroken episodes
+        self.episode_steps += 1
+        reset = done | (self.episode_steps >= self.max_episode_steps)
+        n_reset = np.count_nonzero(reset)
+        if n_reset:
+            next_states[reset] = self._reset_states(n_reset)
+            self.episode_steps[reset] = 0
+            if next_actions is not None:
+                next_actions[reset] = self.select_actions(next_states[reset], epsilon)
+
+        self.states = next_states
+        self.t += 1
+        return next_actions
+
+    def greedy_actions(self):
+        """Greedy actie per state volgens de huidige Q-tabel"""
+        return self.Q.argmax(axis=1)
+
+    def greedy_policy(self):
+        """
+        Returns:
+            dict: Policy dictionary (key=positie, value=Actions) bruikbaar met OptimalPolicy
+        """
+        actions = self.greedy_actions()
+        policy = {}
+        for (i, j), state in self.maze.states.items():
+            s = i * self.maze.width + j
+            policy[(i, j)] = None if state.is_terminal else Actions(int(actions[s]))
+        return policy
+
+    def regret(self):
+        """
+        Gemiddeld verschil in value tussen de referentie-policy en de greedy policy.
+
+        Beide policies worden geëvalueerd over max_episode_steps stappen, dezelfde
+        horizon als tijdens het trainen, zodat een greedy policy die (nog) geen
+        terminal bereikt een eindige regret krijgt.
+
+        Returns:
+            float: Regret gemiddeld over alle niet-terminal states
+        """
+        values = evaluate_policy(self.next_states, self.rewards, self.terminal,
+                                 self.greedy_actions(), self.gamma, self.slip_probability,
+                                 horizon=self.max_episode_steps)
+        return float(np.mean(self.optimal_values[~self.terminal] - values[~self.terminal]))
+
+    def train(self, n_steps, eval_every=100, verbose=True):
+        """
+        Traint de Q-tabel gedurende een aantal lockstep-stappen.
+
+        Args:
+            n_steps: Aantal stappen (elke stap levert n_envs transities op)
+            eval_every: Interval (in stappen) voor het berekenen van de regret
+            verbose: Of voortgang geprint moet worden
+
+        Returns:
+            list: Dictionaries met step, transitions, epsilon, alpha, regret en throughput
+        """
+        history = []
+        next_actions = None
+        train_time = 0.0
+        for i in range(1, n_steps + 1):
+            start = time.perf_counter()
+            next_actions = self.step(next_actions)
+            train_time += time.perf_counter() - start
+
+            if i % eval_every == 0 or i == n_steps:
+                transitions = self.t * self.n_envs
+                record = {
+                    "step": self.t,
+                    "transitions": transitions,
+                    "epsilon": self.epsilon(self.t),
+                    "alpha": self.alpha(self.t),
+                    "regret": self.regret(),
+                    "throughput": i * self.n_envs / train_time,
+                }
+                history.append(record)
+                if verbose:
+                    print(f"Step {record['step']}, Regret: {record['regret']:.4f}, "
+                          f"Transitions/s: {record['throughput']:,.0f}")
+        return history
+
+
+class QLearningTrainer(TDTrainer):
+    """Off-policy TD control: target gebruikt de maximale Q-waarde van de volgende state"""
+
+    def _targets(self, rewards, next_states, done, epsilon):
+        bootstrap = self.Q[next_states].max(axis=1)
+        return rewards + self.gamma * np.where(done, 0.0, bootstrap), None
+
+
+class SarsaTrainer(TDTrainer):
+    """On-policy TD control: target gebruikt de Q-waarde van de volgende gekozen actie"""
+
+    def _targets(self, rewards, next_states, done, epsilon):
+        next_actions = self.select_actions(next_states, epsilon)
+        bootstrap = self.Q[next_states, next_actions]
+        return rewards + self.gamma * np.where(done, 0.0, bootstrap), next_actions
@@ -1,4 +1,4 @@
-def value_iteration(maze, gamma=1.0, theta=0.01):
+def value_iteration(maze, gamma=1.0, theta=0.01, verbose=True):
     """
     Voert value iteration uit op de gegeven maze.
 
@@ -6,6 +6,7 @@ def value_iteration(maze, gamma=1.0, theta=0.01):
         maze: De maze omgeving
         gamma: Discount factor
         theta: Convergentie threshold
+        verbose: Of de delta per iteratie geprint moet worden
 
     Returns:
         tuple: (V: value function dictionary, policy: optimal policy dictionary)
@@ -40,7 +41,8 @@ def value_iteration(maze, gamma=1.0, theta=0.01):
                 V[position] = max_v
                 delta = max(delta, abs(v - V[position]))
 
-        print(f"Iteration {iteration}, Delta: {delta:.6f}")
+        if verbose:
+            print(f"Iteration {iteration}, Delta: {delta:.6f}")
         if delta < theta:
             break
 
@@ -68,7 +70,7 @@ def value_iteration(maze, gamma=1.0, theta=0.01):
     return V, policy
 
 
-def stochastic_value_iteration(maze, gamma=1.0, theta=0.01):
+def stochastic_value_iteration(maze, gamma=1.0, theta=0.01, verbose=True):
     """
     Voert value iteration uit op een stochastische maze.
 
@@ -76,6 +78,7 @@ def stochastic_value_iteration(maze, gamma=1.0, theta=0.01):
         maze: De maze omgeving
         gamma: Discount factor
         theta: Convergentie threshold
+        verbose: Of de delta per iteratie geprint moet worden
 
     Returns:
         tuple: (V: value function dictionary, policy: optimal policy dictionary)
@@ -105,22 +108,23 @@ def stochastic_value_iteration(maze, gamma=1.0, theta=0.01):
                 max_v = float('-inf')
                 for action in maze.actions:
                     expected_value = 0
-                    # Hoofdactie heeft 70% kans
+                    # Hoofdactie heeft standaard 70% kans
                     next_position, reward, _ = maze.deterministic_step(position, action)
-                    expected_value += 0.7 * (reward + gamma * V[next_position])
+                    expected_value += (1 - maze.slip_probability) * (reward + gamma * V[next_position])
 
-                    # Andere acties hebben elk 10% kans
+                    # Andere acties hebben standaard elk 10% kans
                     other_actions = [a for a in maze.actions if a != action]
                     for other_action in other_actions:
                         next_position, reward, _ = maze.deterministic_step(position, other_action)
-                        expected_value += (0.3 / len(other_actions)) * (reward + gamma * V[next_position])
+                        expected_value += (maze.slip_probability / len(other_actions)) * (reward + gamma * V[next_position])
 
                     max_v = max(max_v, expected_value)
 
                 V[position] = max_v
                 delta = max(delta, abs(v - V[position]))
 
-        print(f"Stochastic Iteration {iteration}, Delta: {delta:.6f}")
+        if verbose:
+            print(f"Stochastic Iteration {iteration}, Delta: {delta:.6f}")
         if delta < theta:
             break
 
@@ -138,15 +142,15 @@ def stochastic_value_iteration(maze, gamma=1.0, theta=0.01):
             best_value = float('-inf')
             for action in maze.actions:
                 expected_value = 0
-                # Hoofdactie heeft 70% kans
+                # Hoofdactie heeft standaard 70% kans
                 next_position, reward, _ = maze.deterministic_step(position, action)
-                expected_value += 0.7 * (reward + gamma * V[next_position])
+                expected_value += (1 - maze.slip_probability) * (reward + gamma * V[next_position])
 
-                # Andere acties hebben elk 10% kans
+                # Andere acties hebben standaard elk 10% kans
                 other_actions = [a for a in maze.actions if a != action]
                 for other_action in other_actions:
                     next_position, reward, _ = maze.deterministic_step(position, other_action)
-                    expected_value += (0.3 / len(other_actions)) * (reward + gamma * V[next_position])
+                    expected_value += (maze.slip_probability / len(other_actions)) * (reward + gamma * V[next_position])
 
                 if expected_value > best_value:
                     best_value = expected_value
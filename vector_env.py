@@ -0,0 +1,265 @@
+import multiprocessing as mp
+
+import numpy as np
+
+GOLDEN_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _splitmix64(x):
+    """Vectorized splitmix64 hash: zet uint64 tellers om naar pseudo-random uint64"""
+    x = x + GOLDEN_GAMMA
+    x = (x ^ (x >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    x = (x ^ (x >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return x ^ (x >> np.uint64(31))
+
+
+def instance_seeds(seed, n_envs):
+    """
+    Leidt onafhankelijke seeds af voor elke omgeving.
+
+    Args:
+        seed: Basis-seed (int of None)
+        n_envs: Aantal omgevingen
+
+    Returns:
+        np.ndarray: uint64 seed per omgeving
+    """
+    return np.random.SeedSequence(seed).generate_state(n_envs, dtype=np.uint64)
+
+
+class VectorMaze:
+    """Stateful, gevectoriseerde maze met N parallelle instanties (Gymnasium-stijl API)"""
+
+    def __init__(self, maze, n_envs, stochastic=True, observation="state",
+                 slip_probability=None, max_episode_steps=100, seed=None, seeds=None):
+        """
+        Initialiseert de omgevingen.
+
+        Args:
+            maze: Maze instantie
+            n_envs: Aantal parallelle instanties
+            stochastic: Of de omgeving stochastisch moet zijn
+            observation: "state" voor integer state ids, "onehot" voor one-hot arrays
+            slip_probability: Kans dat een andere actie dan de gekozen wordt uitgevoerd
+                (standaard maze.slip_probability)
+            max_episode_steps: Episodes worden na dit aantal stappen afgebroken (None = nooit)
+            seed: Basis-seed waaruit per instantie een seed wordt afgeleid
+            seeds: Expliciete uint64 seeds per instantie (gaat voor op `seed`)
+        """
+        if observation not in ("state", "onehot"):
+            raise ValueError(f"Onbekend observatietype: {observation}")
+
+        self.maze = maze
+        self.n_envs = n_envs
+        self.stochastic = stochastic
+        self.observation = observation
+        self.slip_probability = maze.slip_probability if slip_probability is None else slip_probability
+        self.max_episode_steps = max_episode_steps
+
+        self.next_states, self.rewards, self.terminal = maze.transition_arrays()
+        self.n_states, self.n_actions = self.rewards.shape
+        self.start_state = maze.start_position[0] * maze.width + maze.start_position[1]
+
+        self.states = np.full(n_envs, self.start_state, dtype=np.int64)
+        self.episode_steps = np.zeros(n_envs, dtype=np.int64)
+        self._seed(seed, seeds)
+
+    def _seed(self, seed=None, seeds=None):
+        """Zet de per-instantie random streams (terug) op hun begin"""
+        self.seeds = np.asarray(seeds, dtype=np.uint64) if seeds is not None else instance_seeds(seed, self.n_envs)
+        self.counters = np.zeros(self.n_envs, dtype=np.uint64)
+
+    def _random(self, mask):
+        """
+        Trekt één uint64 per geselecteerde instantie uit diens eigen stream.
+
+        Elke instantie heeft een eigen teller, zodat de uitkomst niet afhangt
+        van het aantal omgevingen of hoe ze over processen verdeeld zijn.
+        """
+        self.counters[mask] += np.uint64(1)
+        return _splitmix64(self.seeds[mask] ^ _splitmix64(self.counters[mask]))
+
+    def _observe(self, states):
+        """Zet state ids om naar het gekozen observatieformaat"""
+        if self.observation == "state":
+            return states.copy()
+        obs = np.zeros((len(states), self.n_states), dtype=np.float32)
+        obs[np.arange(len(states)), states] = 1.0
+        return obs
+
+    def positions(self):
+        """
+        Returns:
+            np.ndarray: Huidige posities als array [N, 2] van (rij, kolom)
+        """
+        return np.stack(np.divmod(self.states, self.maze.width), axis=1)
+
+    def reset(self, seed=None):
+        """
+        Zet alle instanties terug naar de startpositie.
+
+        Args:
+            seed: Optionele nieuwe basis-seed
+
+        Returns:
+            tuple: (observaties, info dictionary)
+        """
+        if seed is not None:
+            self._seed(seed)
+        self.states[:] = self.start_state
+        self.episode_steps[:] = 0
+        return self._observe(self.states), {}
+
+    def step(self, actions):
+        """
+        Voert één stap uit in alle instanties; afgelopen instanties worden automatisch gereset.
+
+        Args:
+            actions: Array [N] met actie-waarden (Actions.value)
+
+        Returns:
+            tuple: (observaties, rewards, terminated, truncated, info). Voor
+                gereste instanties staat de laatste observatie in
+                info["final_observation"], gemarkeerd door info["_final_observation"].
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        if self.stochastic:
+            draws = self._random(np.ones(self.n_envs, dtype=bool))
+            # Hoogste 53 bits als uniforme float, laagste bits voor de uitwijkrichting
+            uniform = (draws >> np.uint64(11)).astype(np.float64) / float(1 << 53)
+            offset = (draws % np.uint64(self.n_actions - 1)).astype(np.int64) + 1
+            actions = np.where(uniform < self.slip_probability, (actions + offset) % self.n_actions, actions)
+
+        next_states = self.next_states[self.states, actions]
+        rewards = self.rewards[self.states, actions]
+        terminated = self.terminal[next_states]
+
+        self.episode_steps += 1
+        if self.max_episode_steps is None:
+            truncated = np.zeros(self.n_envs, dtype=bool)
+        else:
+            truncated = ~terminated & (self.episode_steps >= self.max_episode_steps)
+
+        info = {}
+        done = terminated | truncated
+        if done.any():
+            info["final_observation"] = self._observe(next_states)
+            info["_final_observation"] = done
+            next_states[done] = self.start_state
+            self.episode_steps[done] = 0
+
+        self.states = next_states
+        return self._observe(next_states), rewards, terminated, truncated, info
+
+    def close(self):
+        """Geen resources om vrij te geven; aanwezig voor een uniforme API"""
+
+
+def _worker(remote, parent_remote, maze, kwargs):
+    """Draait een shard van de omgevingen in een subprocess"""
+    parent_remote.close()
+    env = VectorMaze(maze, **kwargs)
+    try:
+        while True:
+            command, data = remote.recv()
+            if command == "step":
+                remote.send(env.step(data))
+            elif command == "reset":
+                remote.send(env.reset())
+            elif command == "seed":
+                env._seed(seeds=data)
+                remote.send(None)
+            elif command == "close":
+                break
+    except (EOFError, KeyboardInterrupt):
+        pass
+    finally:
+        remote.close()
+
+
+class SubprocVectorMaze:
+    """VectorMaze verdeeld over meerdere subprocessen, met dezelfde API en uitkomsten"""
+
+    def __init__(self, maze, n_envs, n_workers=None, seed=None, context=None, **kwargs):
+        """
+        Start de workers.
+
+        Args:
+            maze: Maze instantie
+            n_envs: Totaal aantal parallelle instanties
+            n_workers: Aantal subprocessen (standaard aantal CPU cores)
+            seed: Basis-seed; instanties krijgen dezelfde seeds als bij VectorMaze
+            context: Multiprocessing start-methode (bijv. "spawn"), standaard die van het platform
+            **kwargs: Overige argumenten voor VectorMaze
+        """
+        n_workers = min(n_envs, n_workers or mp.cpu_count())
+        self.n_envs = n_envs
+        self.observation = kwargs.get("observation", "state")
+        self.bounds = np.linspace(0, n_envs, n_workers + 1).astype(int)
+
+        ctx = mp.get_context(context)
+        seeds = instance_seeds(seed, n_envs)
+        self.remotes, self.processes = [], []
+        for start, end in zip(self.bounds[:-1], self.bounds[1:]):
+            remote, worker_remote = ctx.Pipe()
+            shard_kwargs = dict(kwargs, n_envs=end - start, seeds=seeds[start:end])
+            process = ctx.Process(target=_worker, args=(worker_remote, remote, maze, shard_kwargs), daemon=True)
+            process.start()
+            worker_remote.close()
+            self.remotes.append(remote)
+            self.processes.append(process)
+        self.closed = False
+
+    def reset(self, seed=None):
+        """
+        Zet alle instanties terug naar de startpositie.
+
+        Returns:
+            tuple: (observaties, info dictionary)
+        """
+        if seed is not None:
+            seeds = instance_seeds(seed, self.n_envs)
+            for remote, start, end in zip(self.remotes, self.bounds[:-1], self.bounds[1:]):
+                remote.send(("seed", seeds[start:end]))
+            for remote in self.remotes:
+                remote.recv()
+        for remote in self.remotes:
+            remote.send(("reset", None))
+        results = [remote.recv() for remote in self.remotes]
+        return np.concatenate([obs for obs, _ in results]), {}
+
+    def step(self, actions):
+        """
+        Verdeelt de acties over de workers en voegt de resultaten samen.
+
+        Returns:
+            tuple: (observaties, rewards, terminated, truncated, info) zoals VectorMaze.step
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        for remote, start, end in zip(self.remotes, self.bounds[:-1], self.bounds[1:]):
+            remote.send(("step", actions[start:end]))
+        results = [remote.recv() for remote in self.remotes]
+
+        obs, rewards, terminated, truncated, infos = zip(*results)
+        obs = np.concatenate(obs)
+        info = {}
+        if any(shard_info for shard_info in infos):
+            # Shards zonder afgelopen episodes leveren geen final_observation
+            final = np.zeros_like(obs)
+            mask = np.zeros(self.n_envs, dtype=bool)
+            for shard_info, start, end in zip(infos, self.bounds[:-1], self.bounds[1:]):
+                if shard_info:
+                    final[start:end] = shard_info["final_observation"]
+                    mask[start:end] = shard_info["_final_observation"]
+            info = {"final_observation": final, "_final_observation": mask}
+        return obs, np.concatenate(rewards), np.concatenate(terminated), np.concatenate(truncated), info
+
+    def close(self):
+        """Stopt alle workers"""
+        if self.closed:
+            return
+        for remote in self.remotes:
+            remote.send(("close", None))
+        for process in self.processes:
+            process.join()
+        self.closed = True